@@ -28,6 +28,8 @@ if "bpy" in locals():
         importlib.reload(texaddrec)
     if "export_mqo" in locals():
         importlib.reload(export_mqo)
+    if "texpage" in locals():
+        importlib.reload(texpage)
 
 import bpy
 
@@ -172,6 +174,16 @@ class ExportMQO(bpy.types.Operator, ExportHelper):
         default = "",
         subtype = "FILE_NAME"
     )
+
+    texture_page : bpy.props.BoolProperty(
+        name = "Build texture page",
+        description = "Cut the UV rectangles out of the texture image into a texture page image for TextureAdd",
+        default = False
+    )
+
+    img128 : bpy.props.BoolProperty(
+        name = "128 x 128 image"
+    )
  
     def execute(self, context):
         from . import export_mqo
@@ -179,7 +191,8 @@ class ExportMQO(bpy.types.Operator, ExportHelper):
         export_mqo.export_mqo(self,
             self.properties.filepath, 
             context.scene.objects, 
-            self.scale, active_ob, self.texture)
+            self.scale, active_ob, self.texture,
+            self.texture_page, self.img128)
         return {'FINISHED'}
  
     def invoke(self, context, event):
@@ -30,6 +30,8 @@ Parameter values:
     scale = user defined                 # in original script, scale = 1/(scale slider value), here scale = scale slider value
     active_ob = active object's name     # unlike original script, only active object is exported
     texture = optional texture file name # texture name will be referenced by materials so model will be textured in Metasequoia
+    texture_page = build texture page    # cut the UV rectangles out of the texture image into <file>_page1.png for TextureAdd
+    img128 = 128 x 128 image             # texture page rectangles laid out for a 128 x 128 image
 
 Notes:
     Blender has Z axis up whereas Metasequoia has Y axis up so axes are swapped keeping left and right preserved 
@@ -47,11 +49,12 @@ http://wiki.blender.org/index.php/Dev:2.5/Py/Scripts/Cookbook/Code_snippets/Mult
 import bpy
 import bpy_extras.io_utils
 
-def export_mqo(op,filepath, objects, scale, active_ob, texture):
+def export_mqo(op,filepath, objects, scale, active_ob, texture, texture_page=False, img128=False):
 
     inte_mat = 0
     tmp_mat = []
     obj_tmp = []
+    meshes = []
     
     for ob in objects:
         if (active_ob) and (ob.name != active_ob):
@@ -62,6 +65,7 @@ def export_mqo(op,filepath, objects, scale, active_ob, texture):
             op.report({'ERROR'}, msg)
         else:
             inte_mat, obj_tmp = exp_obj(op, obj_tmp, ob, scale, inte_mat, tmp_mat, texture)
+            meshes.append(ob.data)
 
     if not obj_tmp:
         msg = ".mqo export: Aborting. No objects to export.\n"
@@ -86,6 +90,16 @@ def export_mqo(op,filepath, objects, scale, active_ob, texture):
         msg = ".mqo export: Created file %s" % filepath
         print(msg)
         op.report({'INFO'}, msg)
+
+    if texture_page:
+        if not texture:
+            msg = ".mqo export: Texture page not built. No texture file name"
+            print(msg)
+            op.report({'ERROR'}, msg)
+        else:
+            from . import texpage
+            for me in meshes:
+                texpage.export_pages(op, filepath, me, texture, img128)
     return
     
 def exp_obj(op, fw, ob, scale, inte_mat, tmp_mat, texture):
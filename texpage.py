@@ -0,0 +1,163 @@
+"""
+TextureAdd texture page builder
+
+Builds ready to load texture pages from the image named by the .mqo exporter's
+texture option. The source image is read once with foreach_get, every rectangle
+given by texaddrec.uvtotexinfo is cut out of it and the pages are written as
+PNG files next to the exported file.
+
+Notes:
+    Blender images have origin bottom left, TRLE texture pages have origin top left
+    so the pixel rows are flipped on reading and flipped back on writing
+    Source images of any size are resampled (nearest) to the page, a 128 x 128 layout
+    is placed in the top left corner of the 256 x 256 page as TextureAdd expects
+    Page pixels not covered by a rectangle are left transparent black
+    Float images (16 bit PNG, EXR, HDR) give linear premultiplied pixels so their colour
+    is divided by alpha and converted to sRGB to match byte images and the written page
+"""
+
+import os
+
+import numpy as np
+
+import bpy
+
+from . import texaddrec as ta
+
+PAGE_SIZE = 256
+
+
+def find_image(texture, directory):
+    """returns (image, loaded) for the image named by texture, either already loaded
+       or loaded from disk relative to directory, loaded is True when the image
+       was loaded here and must be removed by the caller, (None, False) if not found"""
+    name = os.path.basename(texture)
+    for img in bpy.data.images:
+        if img.name == name or os.path.basename(bpy.path.abspath(img.filepath)) == name:
+            return img, False
+    path = texture if os.path.isabs(texture) else os.path.join(directory, texture)
+    if os.path.isfile(path):
+        return bpy.data.images.load(path), True
+    return None, False
+
+
+def linear_to_srgb(px):
+    px = np.clip(px, 0.0, 1.0)
+    return np.where(px <= 0.0031308, px * 12.92, 1.055 * np.power(px, 1 / 2.4) - 0.055)
+
+
+def read_pixels(img):
+    """returns image pixels as (height, width, 4) float32 array, origin top left"""
+    width, height = img.size
+    channels = img.channels
+    px = np.empty(width * height * channels, dtype=np.float32)
+    try:
+        img.pixels.foreach_get(px)
+    except AttributeError: # bpy_prop_array has no foreach_get before Blender 2.83
+        px[:] = img.pixels[:]
+    px = px.reshape(height, width, channels)
+    if channels < 4:
+        rgba = np.ones((height, width, 4), dtype=np.float32)
+        rgba[:, :, :3] = px[:, :, :1] if channels < 3 else px[:, :, :3]
+        if channels == 2:
+            rgba[:, :, 3] = px[:, :, 1]
+        px = rgba
+    if img.is_float:
+        alpha = px[:, :, 3:]
+        rgb = np.divide(px[:, :, :3], alpha, out=np.zeros_like(px[:, :, :3]), where=alpha > 0)
+        px[:, :, :3] = linear_to_srgb(rgb)
+    return px[::-1]
+
+
+def mesh_texinfos(me, imgsize=256):
+    """returns a TexInfo for every quad and triangle of the mesh first UV layer
+       in the same order as the .rec exporter, ngons are skipped"""
+    uv_layer = me.uv_layers[0].data
+    # float64 so 1 - v rounds to the same pixel as the .rec exporter
+    uvs = np.empty(len(uv_layer) * 2, dtype=np.float64)
+    uv_layer.foreach_get("uv", uvs)
+    uvs = uvs.reshape(-1, 2)
+    uvs[:, 1] = 1 - uvs[:, 1]
+    texinfos = []
+    for poly in me.polygons:
+        if poly.loop_total in [3,4]:
+            start = poly.loop_start
+            texinfo = ta.uvtotexinfo(uvs[start:start + poly.loop_total].tolist(), imgsize)
+            if texinfo is not None:
+                texinfos.append(texinfo)
+    return texinfos
+
+
+def build_pages(texinfos, src, imgsize=256):
+    """returns {page: (PAGE_SIZE, PAGE_SIZE, 4) array} with every rectangle
+       of texinfos cut out of src, src is resampled so it covers imgsize x imgsize"""
+    height, width = src.shape[:2]
+    # nearest source row/column for each page row/column, all texinfos share them
+    rows = np.minimum(((np.arange(imgsize) + 0.5) * height / imgsize).astype(np.intp), height - 1)
+    cols = np.minimum(((np.arange(imgsize) + 0.5) * width / imgsize).astype(np.intp), width - 1)
+    resampled = src[rows[:, None], cols[None, :]]
+
+    masks = {}
+    for tx in texinfos:
+        mask = masks.get(tx.page)
+        if mask is None:
+            mask = masks[tx.page] = np.zeros((imgsize, imgsize), dtype=bool)
+        x0, x1 = np.clip([tx.x, tx.x + tx.width], 0, imgsize)
+        y0, y1 = np.clip([tx.y, tx.y + tx.height], 0, imgsize)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        mask[y0:y1, x0:x1] = True
+
+    pages = {}
+    for page, mask in masks.items():
+        pixels = np.zeros((PAGE_SIZE, PAGE_SIZE, 4), dtype=np.float32)
+        pixels[:imgsize, :imgsize] = np.where(mask[:, :, None], resampled, 0.0)
+        pages[page] = pixels
+    return pages
+
+
+def write_page(pixels, path):
+    name = os.path.basename(path)
+    img = bpy.data.images.new(name, PAGE_SIZE, PAGE_SIZE, alpha=True)
+    try:
+        img.pixels.foreach_set(np.ascontiguousarray(pixels[::-1]).ravel())
+    except AttributeError: # bpy_prop_array has no foreach_set before Blender 2.83
+        img.pixels[:] = pixels[::-1].ravel().tolist()
+    img.filepath_raw = path
+    img.file_format = "PNG"
+    img.save()
+    bpy.data.images.remove(img)
+    return
+
+
+def export_pages(op, filepath, me, texture, img128=False):
+    """writes <filepath without extension>_page<n>.png for each page used by the mesh"""
+    imgsize = 128 if img128 else 256
+    directory = os.path.dirname(filepath)
+    img, loaded = find_image(texture, directory)
+    if img is None:
+        msg = ".mqo export: Texture page not built. Image %s not found" % texture
+        print(msg)
+        op.report({"ERROR"}, msg)
+        return
+    if img.size[0] == 0 or img.size[1] == 0:
+        msg = ".mqo export: Texture page not built. Image %s has no pixels" % img.name
+        print(msg)
+        op.report({"ERROR"}, msg)
+        if loaded:
+            bpy.data.images.remove(img)
+        return
+
+    texinfos = mesh_texinfos(me, imgsize)
+    src = read_pixels(img)
+    if loaded:
+        bpy.data.images.remove(img)
+    pages = build_pages(texinfos, src, imgsize)
+    base = os.path.splitext(filepath)[0]
+    for page, pixels in sorted(pages.items()):
+        path = "%s_page%d.png" % (base, page)
+        write_page(pixels, path)
+        msg = ".mqo export: Created texture page %s" % path
+        print(msg)
+        op.report({"INFO"}, msg)
+    return